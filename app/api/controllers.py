@@ -2,6 +2,7 @@ import uuid
 from datetime import date
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import ORJSONResponse
 
 from app.api import schemas
 from app.core.models import Habit
@@ -14,7 +15,7 @@ def create_router(habit_service: HabitService) -> APIRouter:
     @router.post(
         "", response_model=schemas.HabitRead, status_code=status.HTTP_201_CREATED
     )
-    def create_habit(payload: schemas.HabitCreate) -> schemas.HabitRead:
+    async def create_habit(payload: schemas.HabitCreate) -> schemas.HabitRead:
         habit = Habit(
             id=str(uuid.uuid4()),
             name=payload.name,
@@ -25,37 +26,37 @@ def create_router(habit_service: HabitService) -> APIRouter:
             parent_id=payload.parent_id,
         )
 
-        habit_service.create_habit(habit)
-        return schemas.HabitRead(**habit.__dict__)
+        await habit_service.create_habit(habit)
+        return schemas.habit_to_read(habit)
 
     @router.get("", response_model=list[schemas.HabitRead])
-    def list_habits() -> list[schemas.HabitRead]:
-        habits = habit_service.list_habits()
-        return [schemas.HabitRead(**h.__dict__) for h in habits]
+    async def list_habits() -> ORJSONResponse:
+        habits = await habit_service.list_habits()
+        return ORJSONResponse([schemas.habit_to_dict(h) for h in habits])
 
     @router.get("/{habit_id}", response_model=schemas.HabitRead)
-    def get_habit(habit_id: str) -> schemas.HabitRead:
-        habit = habit_service.get_habit(habit_id)
+    async def get_habit(habit_id: str) -> schemas.HabitRead:
+        habit = await habit_service.get_habit(habit_id)
         if habit is None:
             raise HTTPException(status_code=404, detail="Habit not found")
 
-        return schemas.HabitRead(**habit.__dict__)
+        return schemas.habit_to_read(habit)
 
     @router.put("/{habit_id}", response_model=schemas.HabitRead)
-    def update_habit(
+    async def update_habit(
         habit_id: str,
         payload: schemas.HabitUpdate,
     ) -> schemas.HabitRead:
         try:
-            habit = habit_service.update_habit(habit_id, payload)
-            return schemas.HabitRead(**habit.__dict__)
+            habit = await habit_service.update_habit(habit_id, payload)
+            return schemas.habit_to_read(habit)
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
 
     @router.delete("/{habit_id}", status_code=status.HTTP_204_NO_CONTENT)
-    def delete_habit(habit_id: str) -> None:
+    async def delete_habit(habit_id: str) -> None:
         try:
-            habit_service.delete_habit(habit_id)
+            await habit_service.delete_habit(habit_id)
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
 
@@ -64,7 +65,7 @@ def create_router(habit_service: HabitService) -> APIRouter:
         response_model=schemas.HabitRead,
         status_code=status.HTTP_201_CREATED,
     )
-    def add_subhabit(
+    async def add_subhabit(
         habit_id: str,
         payload: schemas.HabitCreate,
     ) -> schemas.HabitRead:
@@ -79,8 +80,8 @@ def create_router(habit_service: HabitService) -> APIRouter:
         )
 
         try:
-            habit_service.add_subhabit(habit_id, sub)
-            return schemas.HabitRead(**sub.__dict__)
+            await habit_service.add_subhabit(habit_id, sub)
+            return schemas.habit_to_read(sub)
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
 
@@ -89,41 +90,40 @@ def create_router(habit_service: HabitService) -> APIRouter:
         response_model=schemas.LogRead,
         status_code=status.HTTP_201_CREATED,
     )
-    def record_log(
+    async def record_log(
         habit_id: str,
         payload: schemas.LogCreate,
     ) -> schemas.LogRead:
         try:
-            log = habit_service.record_log(
+            log = await habit_service.record_log(
                 habit_id=habit_id,
                 date_=payload.date,
                 value=payload.value,
             )
-            return schemas.LogRead(**log.__dict__)
+            return schemas.log_to_read(log)
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
 
     @router.get("/{habit_id}/logs", response_model=list[schemas.LogRead])
-    def get_logs(
+    async def get_logs(
         habit_id: str,
         start: date | None = None,
         end: date | None = None,
-    ) -> list[schemas.LogRead]:
+    ) -> ORJSONResponse:
         try:
-            logs = habit_service.get_logs(habit_id, start, end)
-            return [schemas.LogRead(**log.__dict__) for log in logs]
+            logs = await habit_service.get_logs(habit_id, start, end)
+            return ORJSONResponse([schemas.log_to_dict(log) for log in logs])
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
 
     @router.get("/{habit_id}/stats", response_model=schemas.HabitStats)
-    def get_stats(
+    async def get_stats(
         habit_id: str,
         start: date | None = None,
         end: date | None = None,
     ) -> schemas.HabitStats:
         try:
-            stats = habit_service.get_statistics(habit_id, start, end)
-            return schemas.HabitStats(**stats)
+            return await habit_service.get_statistics(habit_id, start, end)
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
 
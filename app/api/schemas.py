@@ -1,8 +1,9 @@
 from datetime import date
+from typing import Any
 
 from pydantic import BaseModel, Field
 
-from app.core.models import HabitType
+from app.core.models import Habit, HabitType, LogEntry
 
 
 class HabitCreate(BaseModel):
@@ -31,6 +32,35 @@ class HabitRead(BaseModel):
     parent_id: str | None
 
 
+# bound once so the per-item mapping skips the classmethod lookup
+_habit_read_build = HabitRead.model_construct
+
+
+def habit_to_read(habit: Habit) -> HabitRead:
+    return _habit_read_build(
+        id=habit.id,
+        name=habit.name,
+        description=habit.description,
+        category=habit.category,
+        type=habit.type,
+        goal=habit.goal,
+        parent_id=habit.parent_id,
+    )
+
+
+def habit_to_dict(habit: Habit) -> dict[str, Any]:
+    # HabitRead's fields as a plain dict, for list responses handed to orjson
+    return {
+        "id": habit.id,
+        "name": habit.name,
+        "description": habit.description,
+        "category": habit.category,
+        "type": habit.type,
+        "goal": habit.goal,
+        "parent_id": habit.parent_id,
+    }
+
+
 class LogCreate(BaseModel):
     date: date
     value: float | None = None
@@ -43,6 +73,27 @@ class LogRead(BaseModel):
     value: float | None
 
 
+_log_read_build = LogRead.model_construct
+
+
+def log_to_read(log: LogEntry) -> LogRead:
+    return _log_read_build(
+        id=log.id,
+        habit_id=log.habit_id,
+        date=log.date,
+        value=log.value,
+    )
+
+
+def log_to_dict(log: LogEntry) -> dict[str, Any]:
+    return {
+        "id": log.id,
+        "habit_id": log.habit_id,
+        "date": log.date,
+        "value": log.value,
+    }
+
+
 class HabitStats(BaseModel):
     habit_id: str
     current_streak: int
@@ -11,7 +11,7 @@ class HabitType(str, Enum):
     NUMERIC = "numeric"
 
 
-@dataclass
+@dataclass(slots=True)
 class LogEntry:
     id: str
     habit_id: str
@@ -31,7 +31,7 @@ class LogEntry:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Habit:
     id: str
     name: str
@@ -43,4 +43,4 @@ class Habit:
         default_factory=lambda: datetime.datetime.now(datetime.UTC)
     )
     parent_id: str | None = None
-    subhabit_ids: list[str] = field(default_factory=list)
+    subhabit_ids: set[str] = field(default_factory=set)
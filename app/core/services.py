@@ -1,8 +1,8 @@
+import asyncio
 from dataclasses import dataclass
 from datetime import date
-from typing import Any
 
-from app.api.schemas import HabitUpdate
+from app.api.schemas import HabitStats, HabitUpdate
 from app.core.models import Habit, LogEntry
 from app.core.statistics import StatisticsCalculatorFactory, StatisticsResult
 from app.db.repository import HabitRepository, LogRepository
@@ -13,17 +13,17 @@ class HabitService:
     habit_repo: HabitRepository
     log_repo: LogRepository
 
-    def create_habit(self, habit: Habit) -> None:
-        self.habit_repo.add(habit)
+    async def create_habit(self, habit: Habit) -> None:
+        await self.habit_repo.add(habit)
 
-    def get_habit(self, habit_id: str) -> Habit | None:
-        return self.habit_repo.get(habit_id)
+    async def get_habit(self, habit_id: str) -> Habit | None:
+        return await self.habit_repo.get(habit_id)
 
-    def list_habits(self) -> list[Habit]:
-        return self.habit_repo.list()
+    async def list_habits(self) -> list[Habit]:
+        return await self.habit_repo.list()
 
-    def update_habit(self, habit_id: str, update: HabitUpdate) -> Habit:
-        habit = self.habit_repo.get(habit_id)
+    async def update_habit(self, habit_id: str, update: HabitUpdate) -> Habit:
+        habit = await self.habit_repo.get(habit_id)
         if habit is None:
             raise ValueError("Habit not found")
 
@@ -36,38 +36,32 @@ class HabitService:
         if update.goal is not None:
             habit.goal = update.goal
 
-        self.habit_repo.update(habit)
+        await self.habit_repo.update(habit)
         return habit
 
-    def delete_habit(self, habit_id: str) -> None:
-        habit = self.habit_repo.get(habit_id)
-        if habit is None:
+    async def delete_habit(self, habit_id: str) -> None:
+        subtree_ids = await self.habit_repo.subtree_ids(habit_id)
+        if not subtree_ids:
             raise ValueError("Habit not found")
 
-        for subhabit_id in habit.subhabit_ids:
-            self.delete_habit(subhabit_id)
-
-        self.habit_repo.delete(habit_id)
+        await self.log_repo.delete_for_habits(subtree_ids)
+        await self.habit_repo.delete_many(subtree_ids)
 
-    def add_subhabit(self, parent_id: str, subhabit: Habit) -> None:
-        parent = self.habit_repo.get(parent_id)
+    async def add_subhabit(self, parent_id: str, subhabit: Habit) -> None:
+        parent = await self.habit_repo.get(parent_id)
         if parent is None:
             raise ValueError("Parent habit not found")
 
         subhabit.parent_id = parent_id
-        parent.subhabit_ids.append(subhabit.id)
+        await self.habit_repo.add(subhabit)
 
-        self.habit_repo.add(subhabit)
-        self.habit_repo.update(parent)
-
-    def record_log(
+    async def record_log(
         self,
         habit_id: str,
         date_: date,
         value: float | None,
     ) -> LogEntry:
-        habit = self.habit_repo.get(habit_id)
-        if habit is None:
+        if not await self.habit_repo.exists(habit_id):
             raise ValueError("Habit not found")
 
         log = LogEntry.create(
@@ -75,46 +69,50 @@ class HabitService:
             date_=date_,
             value=value,
         )
-        self.log_repo.add(log)
+        await self.log_repo.add(log)
         return log
 
-    def get_logs(
+    async def get_logs(
         self,
         habit_id: str,
         start: date | None = None,
         end: date | None = None,
     ) -> list[LogEntry]:
-        habit = self.habit_repo.get(habit_id)
-        if habit is None:
-            raise ValueError("Habit not found")
-
-        return self.log_repo.list_for_habit(
+        logs = await self.log_repo.list_for_habit(
             habit_id=habit_id,
             start=start,
             end=end,
         )
 
-    def get_statistics(
+        # only an empty result can come from an unknown habit
+        if not logs and not await self.habit_repo.exists(habit_id):
+            raise ValueError("Habit not found")
+
+        return logs
+
+    async def get_statistics(
         self,
         habit_id: str,
         start: date | None = None,
         end: date | None = None,
-    ) -> dict[str, Any]:
-        habit = self.habit_repo.get(habit_id)
+    ) -> HabitStats:
+        habit = await self.habit_repo.get(habit_id)
         if habit is None:
             raise ValueError("Habit not found")
 
-        logs = self.log_repo.list_for_habit(habit_id, start, end)
+        logs = await self.log_repo.list_for_habit(habit_id, start, end)
 
         calculator = StatisticsCalculatorFactory.get_calculator(habit.type)
-        result: StatisticsResult = calculator.calculate(habit, logs, start, end)
-
-        return {
-            "habit_id": habit_id,
-            "current_streak": result.current_streak,
-            "longest_streak": result.longest_streak,
-            "total_completions": result.total_completions,
-            "completion_rate": result.completion_rate,
-            "average_value": result.average_value,
-            "total_days_tracked": result.total_days_tracked,
-        }
+        result: StatisticsResult = await asyncio.to_thread(
+            calculator.calculate, habit, logs, start, end
+        )
+
+        return HabitStats.model_construct(
+            habit_id=habit_id,
+            current_streak=result.current_streak,
+            longest_streak=result.longest_streak,
+            total_completions=result.total_completions,
+            completion_rate=result.completion_rate,
+            average_value=result.average_value,
+            total_days_tracked=result.total_days_tracked,
+        )
@@ -1,9 +1,40 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
 from dataclasses import dataclass
-from datetime import date, timedelta
+from datetime import date
+from itertools import pairwise
+from operator import attrgetter
 
 from app.core.models import Habit, HabitType, LogEntry
 
+_log_date = attrgetter("date")
+
+
+def _calculate_streaks(completed_days: Sequence[int], today: int) -> tuple[int, int]:
+    """Streaks over ascending, distinct day ordinals; today is an ordinal too."""
+    if not completed_days:
+        return 0, 0
+
+    # Calculate current streak, walking back from today
+    current_streak = 0
+    expected = today
+    for ordinal in reversed(completed_days):
+        if ordinal > expected:
+            continue  # future entries never count towards the streak
+        if ordinal != expected:
+            break
+        current_streak += 1
+        expected -= 1
+
+    # Calculate longest streak
+    longest_streak = current = 1
+    for previous, ordinal in pairwise(completed_days):
+        current = current + 1 if ordinal - previous == 1 else 1
+        longest_streak = max(longest_streak, current)
+
+    return current_streak, longest_streak
+
 
 @dataclass
 class StatisticsResult:
@@ -24,7 +55,7 @@ class StatisticsCalculator(ABC):
         start: date | None = None,
         end: date | None = None,
     ) -> StatisticsResult:
-        pass
+        """Compute statistics for logs sorted by date, as repositories return."""
 
     def _filter_logs_by_date(
         self,
@@ -32,42 +63,13 @@ class StatisticsCalculator(ABC):
         start: date | None,
         end: date | None,
     ) -> list[LogEntry]:
-        filtered = logs
-        if start:
-            filtered = [log for log in filtered if log.date >= start]
-        if end:
-            filtered = [log for log in filtered if log.date <= end]
-        return filtered
-
-    def _calculate_streaks(self, completed_dates: set[date]) -> tuple[int, int]:
-        if not completed_dates:
-            return 0, 0
-
-        sorted_dates = sorted(completed_dates)
-
-        # Calculate current streak
-        current_streak = 0
-        cursor = date.today()
-        while cursor in completed_dates:
-            current_streak += 1
-            cursor -= timedelta(days=1)
-
-        # Calculate longest streak
-        longest_streak = 0
-        current = 0
-
-        for i in range(len(sorted_dates)):
-            if i == 0:
-                current = 1
-            else:
-                diff = (sorted_dates[i] - sorted_dates[i - 1]).days
-                if diff == 1:
-                    current += 1
-                else:
-                    current = 1
-            longest_streak = max(longest_streak, current)
-
-        return current_streak, longest_streak
+        if start is None and end is None:
+            return logs
+
+        # logs are sorted by date, so the range is a slice
+        lo = 0 if start is None else bisect_left(logs, start, key=_log_date)
+        hi = len(logs) if end is None else bisect_right(logs, end, key=_log_date)
+        return logs[lo:hi]
 
 
 class BooleanStatisticsCalculator(StatisticsCalculator):
@@ -80,14 +82,18 @@ class BooleanStatisticsCalculator(StatisticsCalculator):
     ) -> StatisticsResult:
         filtered_logs = self._filter_logs_by_date(logs, start, end)
 
-        completed_dates: set[date] = set()
-        for log in filtered_logs:
-            if log.value is not None and log.value >= 1.0:
-                completed_dates.add(log.date)
+        # input is date-ordered, so the dict keys stay in day order
+        completed_days = dict.fromkeys(
+            log.date.toordinal()
+            for log in filtered_logs
+            if log.value is not None and log.value >= 1.0
+        )
 
-        current_streak, longest_streak = self._calculate_streaks(completed_dates)
+        current_streak, longest_streak = _calculate_streaks(
+            list(completed_days), date.today().toordinal()
+        )
 
-        total_completions = len(completed_dates)
+        total_completions = len(completed_days)
         total_days = len(filtered_logs) if filtered_logs else 0
         completion_rate = total_completions / total_days if total_days > 0 else 0.0
 
@@ -111,25 +117,34 @@ class NumericStatisticsCalculator(StatisticsCalculator):
     ) -> StatisticsResult:
         filtered_logs = self._filter_logs_by_date(logs, start, end)
 
-        completed_dates: set[date] = set()
-        values: list[float] = []
+        goal = habit.goal
+        completed_days: dict[int, None] = {}
+        value_sum = 0.0
+        value_count = 0
 
+        # One pass accumulates the completions and the running average
         for log in filtered_logs:
-            if log.value is not None:
-                values.append(log.value)
+            value = log.value
+            if value is None:
+                continue
+
+            value_sum += value
+            value_count += 1
 
-                if habit.goal is not None:
-                    if log.value >= habit.goal:
-                        completed_dates.add(log.date)
-                elif log.value > 0:
-                    completed_dates.add(log.date)
+            if goal is not None:
+                if value >= goal:
+                    completed_days[log.date.toordinal()] = None
+            elif value > 0:
+                completed_days[log.date.toordinal()] = None
 
-        current_streak, longest_streak = self._calculate_streaks(completed_dates)
+        current_streak, longest_streak = _calculate_streaks(
+            list(completed_days), date.today().toordinal()
+        )
 
-        total_completions = len(completed_dates)
+        total_completions = len(completed_days)
         total_days = len(filtered_logs) if filtered_logs else 0
         completion_rate = total_completions / total_days if total_days > 0 else 0.0
-        average_value = sum(values) / len(values) if values else None
+        average_value = value_sum / value_count if value_count else None
 
         return StatisticsResult(
             current_streak=current_streak,
@@ -149,10 +164,12 @@ class StatisticsCalculatorFactory:
 
     @classmethod
     def get_calculator(cls, habit_type: HabitType) -> StatisticsCalculator:
-        calculator = cls._calculators.get(habit_type)
-        if calculator is None:
-            raise ValueError(f"No calculator found for habit type: {habit_type}")
-        return calculator
+        try:
+            return cls._calculators[habit_type]
+        except KeyError:
+            raise ValueError(
+                f"No calculator found for habit type: {habit_type}"
+            ) from None
 
     @classmethod
     def register_calculator(
@@ -1,3 +1,6 @@
+import bisect
+from collections import defaultdict
+from collections.abc import Collection, Iterable
 from datetime import date
 
 from app.core.models import Habit, LogEntry
@@ -8,46 +11,107 @@ class InMemoryHabitRepository(HabitRepository):
     def __init__(self) -> None:
         self._storage: dict[str, Habit] = {}
 
-    def add(self, habit: Habit) -> None:
+    async def add(self, habit: Habit) -> None:
         self._storage[habit.id] = habit
+        parent = self._parent_of(habit)
+        if parent is not None:
+            parent.subhabit_ids.add(habit.id)
 
-    def get(self, habit_id: str) -> Habit | None:
+    def _parent_of(self, habit: Habit) -> Habit | None:
+        if habit.parent_id is None:
+            return None
+        return self._storage.get(habit.parent_id)
+
+    async def get(self, habit_id: str) -> Habit | None:
         return self._storage.get(habit_id)
 
-    def list(self) -> list[Habit]:
+    async def exists(self, habit_id: str) -> bool:
+        return habit_id in self._storage
+
+    async def subtree_ids(self, root_id: str) -> list[str]:
+        if root_id not in self._storage:
+            return []
+
+        ids = [root_id]
+        pending = list(self._storage[root_id].subhabit_ids)
+        while pending:
+            habit = self._storage.get(pending.pop())
+            if habit is not None:
+                ids.append(habit.id)
+                pending.extend(habit.subhabit_ids)
+        return ids
+
+    async def list(self) -> list[Habit]:
         return list(self._storage.values())
 
-    def update(self, habit: Habit) -> None:
+    async def update(self, habit: Habit) -> None:
         if habit.id not in self._storage:
             raise KeyError("Habit not found")
         self._storage[habit.id] = habit
 
-    def delete(self, habit_id: str) -> None:
-        self._storage.pop(habit_id, None)
+    async def delete(self, habit_id: str) -> None:
+        habit = self._storage.pop(habit_id, None)
+        parent = self._parent_of(habit) if habit is not None else None
+        if parent is not None:
+            parent.subhabit_ids.discard(habit_id)
+
+    async def delete_many(self, habit_ids: Collection[str]) -> None:
+        for habit_id in habit_ids:
+            await self.delete(habit_id)
+
+    def clear(self) -> None:
+        self._storage.clear()
 
 
 class InMemoryLogRepository(LogRepository):
     def __init__(self) -> None:
         self._storage: list[LogEntry] = []
+        # per-habit logs kept sorted by date, so range reads are a slice;
+        # the parallel date lists let bisect compare dates without a key
+        self._by_habit: defaultdict[str, list[LogEntry]] = defaultdict(list)
+        self._dates_by_habit: defaultdict[str, list[date]] = defaultdict(list)
 
-    def add(self, log: LogEntry) -> None:
+    async def add(self, log: LogEntry) -> None:
         self._storage.append(log)
+        dates = self._dates_by_habit[log.habit_id]
+        index = bisect.bisect_right(dates, log.date)
+        dates.insert(index, log.date)
+        self._by_habit[log.habit_id].insert(index, log)
 
-    def list_for_habit(
+    async def add_many(self, logs: Iterable[LogEntry]) -> None:
+        for log in logs:
+            await self.add(log)
+
+    async def list_for_habit(
         self,
         habit_id: str,
         start: date | None = None,
         end: date | None = None,
     ) -> list[LogEntry]:
-        logs = [log for log in self._storage if log.habit_id == habit_id]
+        logs = self._by_habit.get(habit_id, [])
+        dates = self._dates_by_habit.get(habit_id, [])
 
+        lo = 0
         if start is not None:
-            logs = [log for log in logs if log.date >= start]
+            lo = bisect.bisect_left(dates, start)
 
+        hi = len(logs)
         if end is not None:
-            logs = [log for log in logs if log.date <= end]
+            hi = bisect.bisect_right(dates, end)
 
-        return sorted(logs, key=lambda log: log.date)
+        return logs[lo:hi]
 
-    def list_all(self) -> list[LogEntry]:
+    async def list_all(self) -> list[LogEntry]:
         return list(self._storage)
+
+    async def delete_for_habits(self, habit_ids: Collection[str]) -> None:
+        ids = set(habit_ids)
+        self._storage = [log for log in self._storage if log.habit_id not in ids]
+        for habit_id in ids:
+            self._by_habit.pop(habit_id, None)
+            self._dates_by_habit.pop(habit_id, None)
+
+    def clear(self) -> None:
+        self._storage.clear()
+        self._by_habit.clear()
+        self._dates_by_habit.clear()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Collection, Iterable
 from datetime import date
 from typing import Protocol
 
@@ -7,25 +8,35 @@ from app.core.models import Habit, LogEntry
 
 
 class HabitRepository(Protocol):
-    def add(self, habit: Habit) -> None: ...
+    async def add(self, habit: Habit) -> None: ...
 
-    def get(self, habit_id: str) -> Habit | None: ...
+    async def get(self, habit_id: str) -> Habit | None: ...
 
-    def list(self) -> list[Habit]: ...
+    async def exists(self, habit_id: str) -> bool: ...
 
-    def update(self, habit: Habit) -> None: ...
+    async def subtree_ids(self, root_id: str) -> list[str]: ...
 
-    def delete(self, habit_id: str) -> None: ...
+    async def list(self) -> list[Habit]: ...
+
+    async def update(self, habit: Habit) -> None: ...
+
+    async def delete(self, habit_id: str) -> None: ...
+
+    async def delete_many(self, habit_ids: Collection[str]) -> None: ...
 
 
 class LogRepository(Protocol):
-    def add(self, log: LogEntry) -> None: ...
+    async def add(self, log: LogEntry) -> None: ...
 
-    def list_for_habit(
+    async def add_many(self, logs: Iterable[LogEntry]) -> None: ...
+
+    async def list_for_habit(
         self,
         habit_id: str,
         start: date | None = None,
         end: date | None = None,
     ) -> list[LogEntry]: ...
 
-    def list_all(self) -> list[LogEntry]: ...
+    async def list_all(self) -> list[LogEntry]: ...
+
+    async def delete_for_habits(self, habit_ids: Collection[str]) -> None: ...
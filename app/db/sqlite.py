@@ -1,56 +1,256 @@
-import json
+import asyncio
 import sqlite3
-from datetime import date, datetime
+from collections.abc import AsyncIterator, Collection, Iterable
+from contextlib import asynccontextmanager, closing
+from datetime import UTC, date, datetime
 from typing import Any
 
+import aiosqlite
+import orjson
+
 from app.core.models import Habit, HabitType, LogEntry
 from app.db.repository import HabitRepository, LogRepository
 
+# applied to every connection we open; only journal_mode persists in the file
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+)
+
+HABIT_COLUMNS = "id, name, description, category, type, goal, created_at, parent_id"
+INSERT_HABIT_SQL = f"""
+    INSERT INTO habits ({HABIT_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+# subhabit ids are not stored; they are gathered through idx_habits_parent
+LIST_HABITS_SQL = f"""
+    SELECT {HABIT_COLUMNS},
+        (
+            SELECT json_group_array(child.id) FROM habits AS child
+            WHERE child.parent_id = habits.id
+        ) AS subhabit_ids
+    FROM habits
+"""
+SELECT_HABIT_SQL = f"{LIST_HABITS_SQL} WHERE habits.id = ?"
+HABIT_EXISTS_SQL = "SELECT 1 FROM habits WHERE id = ? LIMIT 1"
+# UNION rather than UNION ALL, so a parent_id cycle cannot recurse forever
+SUBTREE_IDS_SQL = """
+    WITH RECURSIVE subtree(id) AS (
+        SELECT id FROM habits WHERE id = ?
+        UNION
+        SELECT habits.id FROM habits JOIN subtree ON habits.parent_id = subtree.id
+    )
+    SELECT id FROM subtree
+"""
+UPDATE_HABIT_SQL = """
+    UPDATE habits
+    SET name = ?, description = ?, category = ?, goal = ?
+    WHERE id = ?
+"""
+DELETE_HABIT_SQL = "DELETE FROM habits WHERE id = ?"
+DELETE_HABITS_SQL = "DELETE FROM habits WHERE id IN ({placeholders})"
+
+LOG_COLUMNS = "id, habit_id, date, value, created_at"
+INSERT_LOG_SQL = f"INSERT INTO logs ({LOG_COLUMNS}) VALUES (?, ?, ?, ?, ?)"
+SELECT_LOG_SQL = f"SELECT {LOG_COLUMNS} FROM logs WHERE habit_id = ?"
+# keyed by (has start, has end); fixed strings keep sqlite3's statement cache warm
+LIST_LOGS_FOR_HABIT_SQL = {
+    (False, False): f"{SELECT_LOG_SQL} ORDER BY date",
+    (True, False): f"{SELECT_LOG_SQL} AND date >= ? ORDER BY date",
+    (False, True): f"{SELECT_LOG_SQL} AND date <= ? ORDER BY date",
+    (True, True): f"{SELECT_LOG_SQL} AND date >= ? AND date <= ? ORDER BY date",
+}
+LIST_LOGS_SQL = f"SELECT {LOG_COLUMNS} FROM logs"
+DELETE_LOGS_FOR_HABITS_SQL = "DELETE FROM logs WHERE habit_id IN ({placeholders})"
+
+
+# bumped whenever the on-disk layout changes; stored in PRAGMA user_version
+SCHEMA_VERSION = 1
+
+HABITS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        description TEXT,
+        category TEXT,
+        type TEXT NOT NULL,
+        goal REAL,
+        created_at REAL NOT NULL,
+        parent_id TEXT
+    )
+"""
+LOGS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id TEXT PRIMARY KEY,
+        habit_id TEXT NOT NULL,
+        date INTEGER NOT NULL,
+        value REAL,
+        created_at REAL NOT NULL,
+        FOREIGN KEY (habit_id) REFERENCES habits(id)
+    )
+"""
+SCHEMA_SQL = (
+    HABITS_TABLE_SQL.format(table="habits"),
+    "CREATE INDEX IF NOT EXISTS idx_habits_parent ON habits(parent_id)",
+    LOGS_TABLE_SQL.format(table="logs"),
+    # (habit_id, date) serves both the habit lookup and the date range plus
+    # ORDER BY, so the habit_id-only index of older databases is redundant
+    "DROP INDEX IF EXISTS idx_logs_habit_id",
+    "CREATE INDEX IF NOT EXISTS idx_logs_habit_date ON logs(habit_id, date)",
+    "CREATE INDEX IF NOT EXISTS idx_logs_date ON logs(date)",
+)
+
+# version 0 stored dates and timestamps as ISO text and habits carried a JSON
+# subhabit_ids column; column types cannot be altered, so both tables are
+# rebuilt. julianday() of 0001-01-01 is 1721425.5, Python's ordinal 1.
+MIGRATE_HABITS_SQL = (
+    HABITS_TABLE_SQL.format(table="habits_v1"),
+    f"""
+    INSERT INTO habits_v1 ({HABIT_COLUMNS})
+    SELECT id, name, description, category, type, goal,
+        iso_timestamp(created_at), parent_id
+    FROM habits
+    """,
+    "DROP TABLE habits",
+    "ALTER TABLE habits_v1 RENAME TO habits",
+)
+MIGRATE_LOGS_SQL = (
+    LOGS_TABLE_SQL.format(table="logs_v1"),
+    f"""
+    INSERT INTO logs_v1 ({LOG_COLUMNS})
+    SELECT id, habit_id, CAST(julianday(date) - 1721424.5 AS INTEGER), value,
+        iso_timestamp(created_at)
+    FROM logs
+    """,
+    "DROP TABLE logs",
+    "ALTER TABLE logs_v1 RENAME TO logs",
+)
+
+
+def _placeholders(count: int) -> str:
+    return ", ".join("?" * count)
+
+
+def _iso_timestamp(value: str) -> float:
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return moment.timestamp()
+
+
+def _column_types(conn: sqlite3.Connection, table: str) -> dict[str, str]:
+    rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    return {name: type_.upper() for _, name, type_, *_ in rows}
+
+
+def _migrate_from_v0(conn: sqlite3.Connection) -> None:
+    conn.create_function("iso_timestamp", 1, _iso_timestamp, deterministic=True)
+
+    if "subhabit_ids" in _column_types(conn, "habits"):
+        for statement in MIGRATE_HABITS_SQL:
+            conn.execute(statement)
+
+    if _column_types(conn, "logs").get("date") == "TEXT":
+        for statement in MIGRATE_LOGS_SQL:
+            conn.execute(statement)
+
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create the tables, upgrading databases written by older versions.
+
+    conn must be in autocommit mode (isolation_level=None).
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        (version,) = conn.execute("PRAGMA user_version").fetchone()
+        if version < 1:
+            _migrate_from_v0(conn)
+        for statement in SCHEMA_SQL:
+            conn.execute(statement)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+class SQLiteRepository:
+    """Holds one long-lived connection, opened lazily on the event loop.
+
+    db_path may be a plain filename or a "file:" URI, e.g. a shared-cache
+    in-memory database.
+    """
 
-class SQLiteHabitRepository(HabitRepository):
     def __init__(self, db_path: str = "habits.db") -> None:
         self.db_path = db_path
+        self._conn: aiosqlite.Connection | None = None
+        self._conn_lock = asyncio.Lock()
+        # serializes writes so nothing slips into an open transaction
+        self._write_lock = asyncio.Lock()
         self._init_db()
 
     def _init_db(self) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS habits (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    description TEXT,
-                    category TEXT,
-                    type TEXT NOT NULL,
-                    goal REAL,
-                    created_at TEXT NOT NULL,
-                    parent_id TEXT,
-                    subhabit_ids TEXT NOT NULL
+        # both repositories share one schema, so either may create or upgrade it
+        with closing(
+            sqlite3.connect(self.db_path, uri=True, isolation_level=None)
+        ) as conn:
+            _init_schema(conn)
+
+    async def _connection(self) -> aiosqlite.Connection:
+        if self._conn is not None:
+            return self._conn
+
+        async with self._conn_lock:
+            if self._conn is None:
+                conn = await aiosqlite.connect(
+                    self.db_path, isolation_level=None, uri=True
                 )
-            """)
-            conn.commit()
+                conn.row_factory = sqlite3.Row
+                for pragma in CONNECTION_PRAGMAS:
+                    await conn.execute(pragma)
+                self._conn = conn
+            return self._conn
 
-    def _habit_from_row(self, row: tuple[Any, ...]) -> Habit:
+    @asynccontextmanager
+    async def _transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        conn = await self._connection()
+        async with self._write_lock:
+            await conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                await conn.execute("ROLLBACK")
+                raise
+            await conn.execute("COMMIT")
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+
+class SQLiteHabitRepository(SQLiteRepository, HabitRepository):
+    def _habit_from_row(self, row: sqlite3.Row) -> Habit:
         return Habit(
-            id=row[0],
-            name=row[1],
-            description=row[2],
-            category=row[3],
-            type=HabitType(row[4]),
-            goal=row[5],
-            created_at=datetime.fromisoformat(row[6]),
-            parent_id=row[7],
-            subhabit_ids=json.loads(row[8]),
+            id=row["id"],
+            name=row["name"],
+            description=row["description"],
+            category=row["category"],
+            type=HabitType(row["type"]),
+            goal=row["goal"],
+            created_at=datetime.fromtimestamp(row["created_at"], UTC),
+            parent_id=row["parent_id"],
+            subhabit_ids=set(orjson.loads(row["subhabit_ids"])),
         )
 
-    def add(self, habit: Habit) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT INTO habits
-                (id, name, description, category, type, goal,
-                created_at, parent_id, subhabit_ids)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+    async def add(self, habit: Habit) -> None:
+        conn = await self._connection()
+        async with self._write_lock:
+            await conn.execute(
+                INSERT_HABIT_SQL,
                 (
                     habit.id,
                     habit.name,
@@ -58,132 +258,130 @@ class SQLiteHabitRepository(HabitRepository):
                     habit.category,
                     habit.type.value,
                     habit.goal,
-                    habit.created_at.isoformat(),
+                    habit.created_at.timestamp(),
                     habit.parent_id,
-                    json.dumps(habit.subhabit_ids),
                 ),
             )
-            conn.commit()
 
-    def get(self, habit_id: str) -> Habit | None:
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT * FROM habits WHERE id = ?",
-                (habit_id,),
-            )
-            row = cursor.fetchone()
-            return self._habit_from_row(row) if row else None
-
-    def list(self) -> list[Habit]:
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT * FROM habits")
-            return [self._habit_from_row(row) for row in cursor.fetchall()]
-
-    def update(self, habit: Habit) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            result = conn.execute(
-                """
-                UPDATE habits
-                SET name = ?, description = ?, category = ?,
-                    goal = ?, subhabit_ids = ?
-                WHERE id = ?
-                """,
+    async def get(self, habit_id: str) -> Habit | None:
+        conn = await self._connection()
+        # fetched in one worker hop: a cursor left open across an await pins a
+        # read snapshot, and a write interleaved on this connection then fails
+        # with SQLITE_BUSY_SNAPSHOT once the log connection has committed
+        rows = await conn.execute_fetchall(SELECT_HABIT_SQL, (habit_id,))
+        row = next(iter(rows), None)
+        return self._habit_from_row(row) if row else None
+
+    async def exists(self, habit_id: str) -> bool:
+        conn = await self._connection()
+        rows = await conn.execute_fetchall(HABIT_EXISTS_SQL, (habit_id,))
+        return next(iter(rows), None) is not None
+
+    async def subtree_ids(self, root_id: str) -> list[str]:
+        conn = await self._connection()
+        rows = await conn.execute_fetchall(SUBTREE_IDS_SQL, (root_id,))
+        return [row["id"] for row in rows]
+
+    async def list(self) -> list[Habit]:
+        conn = await self._connection()
+        rows = await conn.execute_fetchall(LIST_HABITS_SQL)
+        return [self._habit_from_row(row) for row in rows]
+
+    async def update(self, habit: Habit) -> None:
+        conn = await self._connection()
+        async with (
+            self._write_lock,
+            conn.execute(
+                UPDATE_HABIT_SQL,
                 (
                     habit.name,
                     habit.description,
                     habit.category,
                     habit.goal,
-                    json.dumps(habit.subhabit_ids),
                     habit.id,
                 ),
-            )
-            if result.rowcount == 0:
+            ) as cursor,
+        ):
+            if cursor.rowcount == 0:
                 raise KeyError("Habit not found")
-            conn.commit()
 
-    def delete(self, habit_id: str) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM habits WHERE id = ?", (habit_id,))
-            conn.commit()
+    async def delete(self, habit_id: str) -> None:
+        conn = await self._connection()
+        async with self._write_lock:
+            await conn.execute(DELETE_HABIT_SQL, (habit_id,))
 
+    async def delete_many(self, habit_ids: Collection[str]) -> None:
+        if not habit_ids:
+            return
 
-class SQLiteLogRepository(LogRepository):
-    def __init__(self, db_path: str = "habits.db") -> None:
-        self.db_path = db_path
-        self._init_db()
+        query = DELETE_HABITS_SQL.format(placeholders=_placeholders(len(habit_ids)))
+        conn = await self._connection()
+        async with self._write_lock:
+            await conn.execute(query, tuple(habit_ids))
 
-    def _init_db(self) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS logs (
-                    id TEXT PRIMARY KEY,
-                    habit_id TEXT NOT NULL,
-                    date TEXT NOT NULL,
-                    value REAL,
-                    created_at TEXT NOT NULL,
-                    FOREIGN KEY (habit_id) REFERENCES habits(id)
-                )
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_logs_habit_id
-                ON logs(habit_id)
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_logs_date
-                ON logs(date)
-            """)
-            conn.commit()
-
-    def _log_from_row(self, row: tuple[Any, ...]) -> LogEntry:
+
+class SQLiteLogRepository(SQLiteRepository, LogRepository):
+    @staticmethod
+    def _log_params(log: LogEntry) -> tuple[Any, ...]:
+        return (
+            log.id,
+            log.habit_id,
+            log.date.toordinal(),
+            log.value,
+            log.created_at.timestamp(),
+        )
+
+    def _log_from_row(self, row: sqlite3.Row) -> LogEntry:
         return LogEntry(
-            id=row[0],
-            habit_id=row[1],
-            date=date.fromisoformat(row[2]),
-            value=row[3],
-            created_at=datetime.fromisoformat(row[4]),
+            id=row["id"],
+            habit_id=row["habit_id"],
+            date=date.fromordinal(row["date"]),
+            value=row["value"],
+            created_at=datetime.fromtimestamp(row["created_at"], UTC),
         )
 
-    def add(self, log: LogEntry) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT INTO logs (id, habit_id, date, value, created_at)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    log.id,
-                    log.habit_id,
-                    log.date.isoformat(),
-                    log.value,
-                    log.created_at.isoformat(),
-                ),
+    async def add(self, log: LogEntry) -> None:
+        conn = await self._connection()
+        async with self._write_lock:
+            await conn.execute(INSERT_LOG_SQL, self._log_params(log))
+
+    async def add_many(self, logs: Iterable[LogEntry]) -> None:
+        async with self._transaction() as conn:
+            await conn.executemany(
+                INSERT_LOG_SQL, [self._log_params(log) for log in logs]
             )
-            conn.commit()
 
-    def list_for_habit(
+    async def list_for_habit(
         self,
         habit_id: str,
         start: date | None = None,
         end: date | None = None,
     ) -> list[LogEntry]:
-        with sqlite3.connect(self.db_path) as conn:
-            query = "SELECT * FROM logs WHERE habit_id = ?"
-            params: list[Any] = [habit_id]
+        conn = await self._connection()
+        query = LIST_LOGS_FOR_HABIT_SQL[start is not None, end is not None]
+        params: list[Any] = [habit_id]
+
+        if start is not None:
+            params.append(start.toordinal())
 
-            if start is not None:
-                query += " AND date >= ?"
-                params.append(start.isoformat())
+        if end is not None:
+            params.append(end.toordinal())
 
-            if end is not None:
-                query += " AND date <= ?"
-                params.append(end.isoformat())
+        rows = await conn.execute_fetchall(query, params)
+        return [self._log_from_row(row) for row in rows]
 
-            query += " ORDER BY date"
+    async def list_all(self) -> list[LogEntry]:
+        conn = await self._connection()
+        rows = await conn.execute_fetchall(LIST_LOGS_SQL)
+        return [self._log_from_row(row) for row in rows]
 
-            cursor = conn.execute(query, params)
-            return [self._log_from_row(row) for row in cursor.fetchall()]
+    async def delete_for_habits(self, habit_ids: Collection[str]) -> None:
+        if not habit_ids:
+            return
 
-    def list_all(self) -> list[LogEntry]:
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT * FROM logs")
-            return [self._log_from_row(row) for row in cursor.fetchall()]
+        query = DELETE_LOGS_FOR_HABITS_SQL.format(
+            placeholders=_placeholders(len(habit_ids))
+        )
+        conn = await self._connection()
+        async with self._write_lock:
+            await conn.execute(query, tuple(habit_ids))
@@ -1,6 +1,9 @@
 import os
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from app.api.controllers import create_router
 from app.core.services import HabitService
@@ -15,11 +18,16 @@ def build_app() -> FastAPI:
 
     habit_repo: HabitRepository
     log_repo: LogRepository
+    on_shutdown: list[Callable[[], Awaitable[None]]] = []
 
     if use_sqlite:
         db_path = os.getenv("DB_PATH", "habits.db")  # default base is habits.db
-        habit_repo = SQLiteHabitRepository(db_path)
-        log_repo = SQLiteLogRepository(db_path)
+        sqlite_habit_repo = SQLiteHabitRepository(db_path)
+        sqlite_log_repo = SQLiteLogRepository(db_path)
+        on_shutdown += [sqlite_habit_repo.close, sqlite_log_repo.close]
+
+        habit_repo = sqlite_habit_repo
+        log_repo = sqlite_log_repo
     else:
         habit_repo = InMemoryHabitRepository()
         log_repo = InMemoryLogRepository()
@@ -29,7 +37,13 @@ def build_app() -> FastAPI:
         log_repo=log_repo,
     )
 
-    app = FastAPI()
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        yield
+        for close in on_shutdown:
+            await close()
+
+    app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
     app.include_router(create_router(habit_service))
 
     return app
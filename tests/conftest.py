@@ -0,0 +1,44 @@
+import itertools
+from datetime import timedelta
+from typing import Any
+
+import pytest
+
+from app.core.models import Habit, HabitType, LogEntry
+
+from tests.helpers import TODAY, FreshId, MakeHabit, MakeLog
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def fresh_id() -> FreshId:
+    counter = itertools.count()
+    return lambda: f"id-{next(counter)}"
+
+
+@pytest.fixture
+def make_habit(fresh_id: FreshId) -> MakeHabit:
+    def _make(**overrides: Any) -> Habit:
+        return Habit(
+            id=overrides.pop("id", None) or fresh_id(),
+            name=overrides.pop("name", "Test"),
+            description=overrides.pop("description", None),
+            category=overrides.pop("category", None),
+            type=overrides.pop("type", HabitType.BOOLEAN),
+            goal=overrides.pop("goal", None),
+            **overrides,
+        )
+
+    return _make
+
+
+@pytest.fixture
+def make_log() -> MakeLog:
+    def _make(habit_id: str, days_ago: int, value: float | None) -> LogEntry:
+        return LogEntry.create(habit_id, TODAY - timedelta(days=days_ago), value)
+
+    return _make
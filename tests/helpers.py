@@ -0,0 +1,12 @@
+from collections.abc import Callable
+from datetime import date, timedelta
+
+from app.core.models import Habit, LogEntry
+
+# pinned once so every test in a run agrees on the current day
+TODAY = date.today()
+YESTERDAY = TODAY - timedelta(days=1)
+
+FreshId = Callable[[], str]
+MakeHabit = Callable[..., Habit]
+MakeLog = Callable[[str, int, float | None], LogEntry]
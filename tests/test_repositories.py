@@ -0,0 +1,557 @@
+import asyncio
+import sqlite3
+from contextlib import closing
+from datetime import timedelta
+from pathlib import Path
+from typing import AsyncGenerator, Generator  # noqa: UP035
+
+import pytest
+
+from app.core.models import Habit, HabitType, LogEntry
+from app.db.in_memory import InMemoryHabitRepository, InMemoryLogRepository
+from app.db.repository import HabitRepository, LogRepository
+from app.db.sqlite import SQLiteHabitRepository, SQLiteLogRepository
+
+from tests.helpers import TODAY, YESTERDAY, FreshId, MakeHabit
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(scope="session")
+def db_uri(worker_id: str) -> str:
+    # named per xdist worker ("master" when not distributed)
+    return f"file:habits_test_{worker_id}?mode=memory&cache=shared"
+
+
+@pytest.fixture(scope="session")
+def db_keeper(db_uri: str) -> Generator[sqlite3.Connection]:
+    # a shared-cache memory database lives as long as one connection to it
+    with closing(sqlite3.connect(db_uri, uri=True)) as conn:
+        # constructing the repositories creates the schema once for the session
+        SQLiteHabitRepository(db_uri)
+        SQLiteLogRepository(db_uri)
+        yield conn
+
+
+@pytest.fixture
+def clean_db(db_keeper: sqlite3.Connection, db_uri: str) -> str:
+    db_keeper.executescript("DELETE FROM habits; DELETE FROM logs;")
+    return db_uri
+
+
+@pytest.fixture
+async def sqlite_log_repo(clean_db: str) -> AsyncGenerator[SQLiteLogRepository]:
+    repo = SQLiteLogRepository(clean_db)
+    yield repo
+    await repo.close()
+
+
+# every backend must pass the same contract tests
+@pytest.fixture(params=["memory", "sqlite"], ids=["mem", "sql"])
+async def habit_repo(request: pytest.FixtureRequest) -> AsyncGenerator[HabitRepository]:
+    if request.param == "memory":
+        yield InMemoryHabitRepository()
+        return
+
+    repo = SQLiteHabitRepository(request.getfixturevalue("clean_db"))
+    yield repo
+    await repo.close()
+
+
+@pytest.fixture(params=["memory", "sqlite"], ids=["mem", "sql"])
+async def log_repo(request: pytest.FixtureRequest) -> AsyncGenerator[LogRepository]:
+    if request.param == "memory":
+        yield InMemoryLogRepository()
+        return
+
+    repo = SQLiteLogRepository(request.getfixturevalue("clean_db"))
+    yield repo
+    await repo.close()
+
+
+@pytest.fixture
+def sample_habit(make_habit: MakeHabit) -> Habit:
+    return make_habit(name="Exercise", description="Daily workout", category="Health")
+
+
+class TestHabitRepository:
+    async def test_add_and_get(
+        self,
+        habit_repo: HabitRepository,
+        sample_habit: Habit,
+    ) -> None:
+        await habit_repo.add(sample_habit)
+        retrieved = await habit_repo.get(sample_habit.id)
+
+        assert retrieved is not None
+        assert retrieved.id == sample_habit.id
+        assert retrieved.name == sample_habit.name
+        assert retrieved.type == sample_habit.type
+        assert retrieved.created_at == sample_habit.created_at
+
+    async def test_get_nonexistent(self, habit_repo: HabitRepository) -> None:
+        result = await habit_repo.get("nonexistent-id")
+        assert result is None
+
+    async def test_exists(
+        self,
+        habit_repo: HabitRepository,
+        sample_habit: Habit,
+    ) -> None:
+        await habit_repo.add(sample_habit)
+
+        assert await habit_repo.exists(sample_habit.id)
+        assert not await habit_repo.exists("nonexistent-id")
+
+    async def test_list(
+        self, habit_repo: HabitRepository, make_habit: MakeHabit
+    ) -> None:
+        habit1 = make_habit(name="Habit 1")
+        habit2 = make_habit(name="Habit 2", type=HabitType.NUMERIC, goal=10.0)
+
+        await habit_repo.add(habit1)
+        await habit_repo.add(habit2)
+
+        habits = await habit_repo.list()
+        assert len(habits) == 2
+        assert {h.id for h in habits} == {habit1.id, habit2.id}
+
+    async def test_update(
+        self,
+        habit_repo: HabitRepository,
+        sample_habit: Habit,
+    ) -> None:
+        await habit_repo.add(sample_habit)
+
+        sample_habit.name = "Updated Name"
+        sample_habit.description = "Updated description"
+        await habit_repo.update(sample_habit)
+
+        retrieved = await habit_repo.get(sample_habit.id)
+        assert retrieved is not None
+        assert retrieved.name == "Updated Name"
+        assert retrieved.description == "Updated description"
+
+    async def test_update_nonexistent(
+        self,
+        habit_repo: HabitRepository,
+        sample_habit: Habit,
+    ) -> None:
+        with pytest.raises(KeyError, match="Habit not found"):
+            await habit_repo.update(sample_habit)
+
+    async def test_delete(
+        self,
+        habit_repo: HabitRepository,
+        sample_habit: Habit,
+    ) -> None:
+        await habit_repo.add(sample_habit)
+        await habit_repo.delete(sample_habit.id)
+
+        result = await habit_repo.get(sample_habit.id)
+        assert result is None
+
+    async def test_delete_many(
+        self,
+        habit_repo: HabitRepository,
+        sample_habit: Habit,
+        make_habit: MakeHabit,
+    ) -> None:
+        other = make_habit(name="Other")
+
+        await habit_repo.add(sample_habit)
+        await habit_repo.add(other)
+        await habit_repo.delete_many([sample_habit.id])
+
+        assert await habit_repo.get(sample_habit.id) is None
+        assert await habit_repo.get(other.id) is not None
+
+    async def test_subtree_ids(
+        self, habit_repo: HabitRepository, make_habit: MakeHabit
+    ) -> None:
+        root = make_habit(name="Root")
+        child = make_habit(parent_id=root.id)
+        grandchild = make_habit(parent_id=child.id)
+        unrelated = make_habit(name="Unrelated")
+
+        for habit in (root, child, grandchild, unrelated):
+            await habit_repo.add(habit)
+
+        assert sorted(await habit_repo.subtree_ids(root.id)) == sorted(
+            [root.id, child.id, grandchild.id]
+        )
+        assert await habit_repo.subtree_ids(grandchild.id) == [grandchild.id]
+        assert await habit_repo.subtree_ids("missing") == []
+
+    async def test_subhabit_ids_from_parent_id(
+        self, habit_repo: HabitRepository, make_habit: MakeHabit
+    ) -> None:
+        parent = make_habit(name="Parent")
+
+        sub = make_habit(name="Sub", parent_id=parent.id)
+
+        await habit_repo.add(parent)
+        await habit_repo.add(sub)
+        retrieved = await habit_repo.get(parent.id)
+
+        assert retrieved is not None
+        assert retrieved.subhabit_ids == {sub.id}
+
+        await habit_repo.delete(sub.id)
+        retrieved = await habit_repo.get(parent.id)
+
+        assert retrieved is not None
+        assert retrieved.subhabit_ids == set()
+
+    async def test_subhabit_ids_with_separator_characters(
+        self, habit_repo: HabitRepository, make_habit: MakeHabit
+    ) -> None:
+        parent = make_habit(name="Parent")
+        children = [
+            make_habit(id=child_id, parent_id=parent.id)
+            for child_id in ("a,b", 'quote"d', "c")
+        ]
+
+        await habit_repo.add(parent)
+        for child in children:
+            await habit_repo.add(child)
+        retrieved = await habit_repo.get(parent.id)
+
+        assert retrieved is not None
+        assert retrieved.subhabit_ids == {"a,b", 'quote"d', "c"}
+
+
+class TestLogRepository:
+    async def test_add_and_list(
+        self,
+        log_repo: LogRepository,
+        sample_habit: Habit,
+    ) -> None:
+        log = LogEntry.create(
+            habit_id=sample_habit.id,
+            date_=TODAY,
+            value=1.0,
+        )
+
+        await log_repo.add(log)
+        logs = await log_repo.list_for_habit(sample_habit.id)
+
+        assert len(logs) == 1
+        assert logs[0].id == log.id
+        assert logs[0].value == 1.0
+        assert logs[0].date == log.date
+        assert logs[0].created_at == log.created_at
+
+    async def test_list_for_habit_filters_by_habit(
+        self, log_repo: LogRepository, fresh_id: FreshId
+    ) -> None:
+        habit1_id = fresh_id()
+        habit2_id = fresh_id()
+
+        log1 = LogEntry.create(habit1_id, TODAY, 1.0)
+        log2 = LogEntry.create(habit2_id, TODAY, 1.0)
+
+        await log_repo.add_many([log1, log2])
+
+        logs = await log_repo.list_for_habit(habit1_id)
+
+        assert len(logs) == 1
+        assert logs[0].habit_id == habit1_id
+
+    @pytest.mark.parametrize(
+        ("start_days_ago", "end_days_ago", "expected_days_ago"),
+        [
+            (None, None, [10, 5, 0]),
+            (7, None, [5, 0]),
+            (None, 7, [10]),
+            (7, 1, [5]),
+        ],
+        ids=["unbounded", "start", "end", "both"],
+    )
+    async def test_list_for_habit_range_bounds(
+        self,
+        log_repo: LogRepository,
+        fresh_id: FreshId,
+        start_days_ago: int | None,
+        end_days_ago: int | None,
+        expected_days_ago: list[int],
+    ) -> None:
+        habit_id = fresh_id()
+        await log_repo.add_many(
+            LogEntry.create(habit_id, TODAY - timedelta(days=days), 1.0)
+            for days in (0, 5, 10)
+        )
+
+        logs = await log_repo.list_for_habit(
+            habit_id,
+            start=None
+            if start_days_ago is None
+            else TODAY - timedelta(days=start_days_ago),
+            end=None if end_days_ago is None else TODAY - timedelta(days=end_days_ago),
+        )
+
+        assert [log.date for log in logs] == [
+            TODAY - timedelta(days=days) for days in expected_days_ago
+        ]
+
+    async def test_add_many(self, log_repo: LogRepository, fresh_id: FreshId) -> None:
+        habit_id = fresh_id()
+
+        await log_repo.add_many(
+            LogEntry.create(habit_id, TODAY - timedelta(days=i), 1.0) for i in range(3)
+        )
+
+        logs = await log_repo.list_for_habit(habit_id)
+        assert len(logs) == 3
+
+    async def test_delete_for_habits(
+        self, log_repo: LogRepository, fresh_id: FreshId
+    ) -> None:
+        habit1_id = fresh_id()
+        habit2_id = fresh_id()
+
+        await log_repo.add_many(
+            [
+                LogEntry.create(habit1_id, TODAY, 1.0),
+                LogEntry.create(habit2_id, TODAY, 1.0),
+            ]
+        )
+
+        await log_repo.delete_for_habits([habit1_id])
+
+        assert await log_repo.list_for_habit(habit1_id) == []
+        assert len(await log_repo.list_for_habit(habit2_id)) == 1
+
+    async def test_list_all(self, log_repo: LogRepository, fresh_id: FreshId) -> None:
+        habit1_id = fresh_id()
+        habit2_id = fresh_id()
+
+        log1 = LogEntry.create(habit1_id, TODAY, 1.0)
+        log2 = LogEntry.create(habit2_id, TODAY, 1.0)
+
+        await log_repo.add_many([log1, log2])
+
+        all_logs = await log_repo.list_all()
+        assert len(all_logs) == 2
+
+    async def test_logs_sorted_by_date(
+        self, log_repo: LogRepository, fresh_id: FreshId
+    ) -> None:
+        habit_id = fresh_id()
+
+        log1 = LogEntry.create(habit_id, TODAY - timedelta(days=2), 1.0)
+        log2 = LogEntry.create(habit_id, TODAY, 1.0)
+        log3 = LogEntry.create(habit_id, YESTERDAY, 1.0)
+
+        await log_repo.add_many([log1, log2, log3])
+
+        logs = await log_repo.list_for_habit(habit_id)
+
+        assert logs[0].date == TODAY - timedelta(days=2)
+        assert logs[1].date == YESTERDAY
+        assert logs[2].date == TODAY
+
+
+class TestInMemoryClear:
+    async def test_clear(self, make_habit: MakeHabit) -> None:
+        habit_repo = InMemoryHabitRepository()
+        log_repo = InMemoryLogRepository()
+        habit = make_habit()
+        await habit_repo.add(habit)
+        await log_repo.add(LogEntry.create(habit.id, TODAY, 1.0))
+
+        habit_repo.clear()
+        log_repo.clear()
+
+        assert await habit_repo.list() == []
+        assert await log_repo.list_all() == []
+        assert await log_repo.list_for_habit(habit.id) == []
+
+
+class TestSQLiteConcurrency:
+    async def test_reads_interleaved_with_writes(
+        self, tmp_path: Path, make_habit: MakeHabit, fresh_id: FreshId
+    ) -> None:
+        # WAL snapshots only exist on a file database
+        db_path = str(tmp_path / "habits.db")
+        habit_repo = SQLiteHabitRepository(db_path)
+        log_repo = SQLiteLogRepository(db_path)
+        habit = make_habit()
+        await habit_repo.add(habit)
+
+        try:
+            for _ in range(100):
+                await asyncio.gather(
+                    *(habit_repo.get(habit.id) for _ in range(5)),
+                    *(habit_repo.exists(habit.id) for _ in range(5)),
+                    *(
+                        log_repo.add(LogEntry.create(fresh_id(), TODAY, 1.0))
+                        for _ in range(5)
+                    ),
+                    habit_repo.update(habit),
+                )
+        finally:
+            await habit_repo.close()
+            await log_repo.close()
+
+
+class TestSQLiteLogStorage:
+    async def test_date_stored_as_ordinal(
+        self,
+        db_keeper: sqlite3.Connection,
+        sqlite_log_repo: SQLiteLogRepository,
+        fresh_id: FreshId,
+    ) -> None:
+        log = LogEntry.create(fresh_id(), TODAY, 1.0)
+        await sqlite_log_repo.add(log)
+
+        (stored,) = db_keeper.execute("SELECT date FROM logs").fetchone()
+
+        assert stored == TODAY.toordinal()
+
+    def test_list_for_habit_uses_habit_date_index(
+        self, db_keeper: sqlite3.Connection
+    ) -> None:
+        plan = db_keeper.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM logs"
+            " WHERE habit_id = ? AND date >= ? ORDER BY date",
+            ("habit", 0),
+        ).fetchall()
+
+        details = " ".join(row[-1] for row in plan)
+        assert "idx_logs_habit_date" in details
+        assert "TEMP B-TREE" not in details
+
+    async def test_add_many_is_atomic(
+        self, sqlite_log_repo: SQLiteLogRepository, fresh_id: FreshId
+    ) -> None:
+        habit_id = fresh_id()
+        log = LogEntry.create(habit_id, TODAY, 1.0)
+
+        with pytest.raises(sqlite3.IntegrityError):
+            await sqlite_log_repo.add_many([log, log])
+
+        assert await sqlite_log_repo.list_for_habit(habit_id) == []
+
+
+LegacyDb = tuple[str, Habit, Habit, list[LogEntry]]
+
+# the layout written before PRAGMA user_version was introduced
+LEGACY_SCHEMA = """
+    CREATE TABLE habits (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        description TEXT,
+        category TEXT,
+        type TEXT NOT NULL,
+        goal REAL,
+        created_at TEXT NOT NULL,
+        parent_id TEXT,
+        subhabit_ids TEXT NOT NULL
+    );
+    CREATE TABLE logs (
+        id TEXT PRIMARY KEY,
+        habit_id TEXT NOT NULL,
+        date TEXT NOT NULL,
+        value REAL,
+        created_at TEXT NOT NULL,
+        FOREIGN KEY (habit_id) REFERENCES habits(id)
+    );
+    CREATE INDEX idx_logs_habit_id ON logs(habit_id);
+    CREATE INDEX idx_logs_date ON logs(date);
+"""
+
+
+class TestSQLiteMigration:
+    @pytest.fixture
+    def legacy_db(self, tmp_path: Path, make_habit: MakeHabit) -> LegacyDb:
+        parent = make_habit(name="Parent")
+        child = make_habit(name="Child", parent_id=parent.id)
+        logs = [
+            LogEntry.create(parent.id, TODAY - timedelta(days=days), 1.0)
+            for days in (3, 0)
+        ]
+
+        path = str(tmp_path / "legacy.db")
+        with closing(sqlite3.connect(path)) as conn:
+            conn.executescript(LEGACY_SCHEMA)
+            conn.executemany(
+                "INSERT INTO habits VALUES (?, ?, NULL, NULL, ?, NULL, ?, ?, ?)",
+                [
+                    (
+                        habit.id,
+                        habit.name,
+                        habit.type.value,
+                        habit.created_at.isoformat(),
+                        habit.parent_id,
+                        subhabit_ids,
+                    )
+                    for habit, subhabit_ids in (
+                        (parent, f'["{child.id}"]'),
+                        (child, "[]"),
+                    )
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO logs VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        log.id,
+                        log.habit_id,
+                        log.date.isoformat(),
+                        log.value,
+                        log.created_at.isoformat(),
+                    )
+                    for log in logs
+                ],
+            )
+            conn.commit()
+
+        return path, parent, child, logs
+
+    async def test_upgrades_legacy_database(
+        self, legacy_db: LegacyDb, make_habit: MakeHabit
+    ) -> None:
+        path, parent, child, logs = legacy_db
+
+        habit_repo = SQLiteHabitRepository(path)
+        log_repo = SQLiteLogRepository(path)
+        try:
+            retrieved = await habit_repo.get(parent.id)
+            assert retrieved is not None
+            assert retrieved.created_at == parent.created_at
+            assert retrieved.subhabit_ids == {child.id}
+
+            migrated = await log_repo.list_for_habit(parent.id, start=YESTERDAY)
+            assert [(log.id, log.date, log.created_at) for log in migrated] == [
+                (logs[1].id, logs[1].date, logs[1].created_at)
+            ]
+
+            # the dropped subhabit_ids column no longer blocks inserts
+            new_habit = make_habit(name="New")
+            await habit_repo.add(new_habit)
+            assert await habit_repo.exists(new_habit.id)
+        finally:
+            await habit_repo.close()
+            await log_repo.close()
+
+        with closing(sqlite3.connect(path)) as conn:
+            (version,) = conn.execute("PRAGMA user_version").fetchone()
+            indexes = {row[1] for row in conn.execute("PRAGMA index_list(logs)")}
+
+        assert version == 1
+        assert "idx_logs_habit_id" not in indexes
+        assert "idx_logs_habit_date" in indexes
+
+    def test_upgrade_is_applied_once(self, legacy_db: LegacyDb) -> None:
+        path, *_ = legacy_db
+
+        SQLiteHabitRepository(path)
+        with closing(sqlite3.connect(path)) as conn:
+            before = conn.execute("SELECT * FROM logs ORDER BY id").fetchall()
+
+        SQLiteLogRepository(path)
+        with closing(sqlite3.connect(path)) as conn:
+            after = conn.execute("SELECT * FROM logs ORDER BY id").fetchall()
+
+        assert after == before
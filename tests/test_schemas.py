@@ -0,0 +1,86 @@
+"""Unit tests for response schemas."""
+
+from typing import Any
+
+from app.api.schemas import (
+    HabitRead,
+    HabitStats,
+    LogRead,
+    habit_to_dict,
+    habit_to_read,
+    log_to_dict,
+    log_to_read,
+)
+from app.core.models import Habit, HabitType, LogEntry
+
+from tests.helpers import TODAY, FreshId
+
+
+class TestTrustedConstruction:
+    """model_construct must stay equivalent to a validated build."""
+
+    def test_habit_read(self, fresh_id: FreshId) -> None:
+        habit = Habit(
+            id=fresh_id(),
+            name="Exercise",
+            description="Daily workout",
+            category="Health",
+            type=HabitType.NUMERIC,
+            goal=10.0,
+            parent_id=fresh_id(),
+        )
+
+        constructed = habit_to_read(habit)
+        validated = HabitRead.model_validate(habit, from_attributes=True)
+
+        assert constructed.model_dump() == validated.model_dump()
+
+    def test_log_read(self, fresh_id: FreshId) -> None:
+        log = LogEntry.create(fresh_id(), TODAY, 2.5)
+
+        constructed = log_to_read(log)
+        validated = LogRead.model_validate(log, from_attributes=True)
+
+        assert constructed.model_dump() == validated.model_dump()
+
+    def test_habit_stats(self, fresh_id: FreshId) -> None:
+        stats: dict[str, Any] = {
+            "habit_id": fresh_id(),
+            "current_streak": 3,
+            "longest_streak": 5,
+            "total_completions": 8,
+            "completion_rate": 0.8,
+            "average_value": None,
+            "total_days_tracked": 10,
+        }
+
+        constructed = HabitStats.model_construct(**stats)
+        validated = HabitStats(**stats)
+
+        assert constructed.model_dump() == validated.model_dump()
+
+
+class TestPlainDicts:
+    """List endpoints skip the models but must emit the same fields."""
+
+    def test_habit_dict(self, fresh_id: FreshId) -> None:
+        habit = Habit(
+            id=fresh_id(),
+            name="Exercise",
+            description=None,
+            category=None,
+            type=HabitType.BOOLEAN,
+            goal=None,
+            subhabit_ids={fresh_id()},
+        )
+
+        validated = HabitRead.model_validate(habit, from_attributes=True)
+
+        assert habit_to_dict(habit) == validated.model_dump()
+
+    def test_log_dict(self, fresh_id: FreshId) -> None:
+        log = LogEntry.create(fresh_id(), TODAY, None)
+
+        validated = LogRead.model_validate(log, from_attributes=True)
+
+        assert log_to_dict(log) == validated.model_dump()
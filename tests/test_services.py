@@ -1,7 +1,6 @@
 """Unit tests for services."""
 
-import uuid
-from datetime import date, timedelta
+from datetime import timedelta
 
 import pytest
 
@@ -10,301 +9,330 @@ from app.core.models import Habit, HabitType
 from app.core.services import HabitService
 from app.db.in_memory import InMemoryHabitRepository, InMemoryLogRepository
 
+from tests.helpers import TODAY, YESTERDAY, MakeHabit
+
+pytestmark = pytest.mark.anyio
+
+# validated once at import; the service only reads them
+UPDATE_EXERCISE = HabitUpdate(
+    name="Updated Exercise",
+    description="New description",
+    category="Fitness",
+    goal=10.0,
+)
+UPDATE_TEST = HabitUpdate(name="Test")
+
+
+InMemoryRepos = tuple[InMemoryHabitRepository, InMemoryLogRepository]
+
+
+@pytest.fixture(scope="module")
+def in_memory_repos() -> InMemoryRepos:
+    return InMemoryHabitRepository(), InMemoryLogRepository()
+
+
+@pytest.fixture(scope="module")
+def shared_service(in_memory_repos: InMemoryRepos) -> HabitService:
+    habit_repo, log_repo = in_memory_repos
+    return HabitService(habit_repo=habit_repo, log_repo=log_repo)
+
 
 @pytest.fixture
-def habit_service() -> HabitService:
-    return HabitService(
-        habit_repo=InMemoryHabitRepository(),
-        log_repo=InMemoryLogRepository(),
-    )
+def habit_service(
+    in_memory_repos: InMemoryRepos, shared_service: HabitService
+) -> HabitService:
+    # reuse one service per module, emptied before each test
+    for repo in in_memory_repos:
+        repo.clear()
+    return shared_service
 
 
 @pytest.fixture
-def sample_habit() -> Habit:
-    return Habit(
-        id=str(uuid.uuid4()),
-        name="Exercise",
-        description="Daily workout",
-        category="Health",
-        type=HabitType.BOOLEAN,
-        goal=None,
-    )
+def sample_habit(make_habit: MakeHabit) -> Habit:
+    return make_habit(name="Exercise", description="Daily workout", category="Health")
 
 
 class TestHabitCRUD:
-    def test_create_habit(
+    async def test_create_habit(
         self, habit_service: HabitService, sample_habit: Habit
     ) -> None:
-        habit_service.create_habit(sample_habit)
+        await habit_service.create_habit(sample_habit)
 
-        retrieved = habit_service.get_habit(sample_habit.id)
+        retrieved = await habit_service.get_habit(sample_habit.id)
         assert retrieved is not None
         assert retrieved.name == sample_habit.name
 
-    def test_get_nonexistent_habit(self, habit_service: HabitService) -> None:
-        result = habit_service.get_habit("nonexistent-id")
+    async def test_get_nonexistent_habit(self, habit_service: HabitService) -> None:
+        result = await habit_service.get_habit("nonexistent-id")
         assert result is None
 
-    def test_list_habits(self, habit_service: HabitService) -> None:
-        habit1 = Habit(
-            id=str(uuid.uuid4()),
-            name="Habit 1",
-            description=None,
-            category=None,
-            type=HabitType.BOOLEAN,
-            goal=None,
-        )
-        habit2 = Habit(
-            id=str(uuid.uuid4()),
-            name="Habit 2",
-            description=None,
-            category=None,
-            type=HabitType.NUMERIC,
-            goal=5.0,
-        )
+    async def test_list_habits(
+        self, habit_service: HabitService, make_habit: MakeHabit
+    ) -> None:
+        habit1 = make_habit(name="Habit 1")
+        habit2 = make_habit(name="Habit 2", type=HabitType.NUMERIC, goal=5.0)
 
-        habit_service.create_habit(habit1)
-        habit_service.create_habit(habit2)
+        await habit_service.create_habit(habit1)
+        await habit_service.create_habit(habit2)
 
-        habits = habit_service.list_habits()
+        habits = await habit_service.list_habits()
         assert len(habits) == 2
 
-    def test_update_habit(
+    async def test_update_habit(
         self, habit_service: HabitService, sample_habit: Habit
     ) -> None:
-        habit_service.create_habit(sample_habit)
-
-        update = HabitUpdate(
-            name="Updated Exercise",
-            description="New description",
-            category="Fitness",
-            goal=10.0,
-        )
+        await habit_service.create_habit(sample_habit)
 
-        updated = habit_service.update_habit(sample_habit.id, update)
+        updated = await habit_service.update_habit(sample_habit.id, UPDATE_EXERCISE)
 
         assert updated.name == "Updated Exercise"
         assert updated.description == "New description"
         assert updated.category == "Fitness"
         assert updated.goal == 10.0
 
-    def test_update_nonexistent_habit(self, habit_service: HabitService) -> None:
-        update = HabitUpdate(name="Test")
-
+    async def test_update_nonexistent_habit(self, habit_service: HabitService) -> None:
         with pytest.raises(ValueError, match="Habit not found"):
-            habit_service.update_habit("nonexistent-id", update)
+            await habit_service.update_habit("nonexistent-id", UPDATE_TEST)
 
-    def test_delete_habit(
+    async def test_delete_habit(
         self, habit_service: HabitService, sample_habit: Habit
     ) -> None:
-        habit_service.create_habit(sample_habit)
-        habit_service.delete_habit(sample_habit.id)
+        await habit_service.create_habit(sample_habit)
+        await habit_service.delete_habit(sample_habit.id)
 
-        result = habit_service.get_habit(sample_habit.id)
+        result = await habit_service.get_habit(sample_habit.id)
         assert result is None
 
-    def test_delete_nonexistent_habit(self, habit_service: HabitService) -> None:
+    async def test_delete_nonexistent_habit(self, habit_service: HabitService) -> None:
         with pytest.raises(ValueError, match="Habit not found"):
-            habit_service.delete_habit("nonexistent-id")
+            await habit_service.delete_habit("nonexistent-id")
 
 
 class TestSubhabits:
-    def test_add_subhabit(self, habit_service: HabitService) -> None:
-        parent = Habit(
-            id=str(uuid.uuid4()),
-            name="Morning Routine",
-            description=None,
-            category="Routines",
-            type=HabitType.BOOLEAN,
-            goal=None,
-        )
+    async def test_add_subhabit(
+        self, habit_service: HabitService, make_habit: MakeHabit
+    ) -> None:
+        parent = make_habit(name="Morning Routine", category="Routines")
 
-        subhabit = Habit(
-            id=str(uuid.uuid4()),
-            name="Meditate",
-            description=None,
-            category="Health",
-            type=HabitType.BOOLEAN,
-            goal=None,
-        )
+        subhabit = make_habit(name="Meditate", category="Health")
 
-        habit_service.create_habit(parent)
-        habit_service.add_subhabit(parent.id, subhabit)
+        await habit_service.create_habit(parent)
+        await habit_service.add_subhabit(parent.id, subhabit)
 
-        retrieved_parent = habit_service.get_habit(parent.id)
-        retrieved_sub = habit_service.get_habit(subhabit.id)
+        retrieved_parent = await habit_service.get_habit(parent.id)
+        retrieved_sub = await habit_service.get_habit(subhabit.id)
 
         assert retrieved_parent is not None
         assert subhabit.id in retrieved_parent.subhabit_ids
         assert retrieved_sub is not None
         assert retrieved_sub.parent_id == parent.id
 
-    def test_add_subhabit_to_nonexistent_parent(
-        self,
-        habit_service: HabitService,
+    async def test_add_subhabit_to_nonexistent_parent(
+        self, habit_service: HabitService, make_habit: MakeHabit
     ) -> None:
-        subhabit = Habit(
-            id=str(uuid.uuid4()),
-            name="Test",
-            description=None,
-            category=None,
-            type=HabitType.BOOLEAN,
-            goal=None,
-        )
+        subhabit = make_habit()
 
         with pytest.raises(ValueError, match="Parent habit not found"):
-            habit_service.add_subhabit("nonexistent-id", subhabit)
+            await habit_service.add_subhabit("nonexistent-id", subhabit)
 
-    def test_delete_habit_with_subhabits(self, habit_service: HabitService) -> None:
-        parent = Habit(
-            id=str(uuid.uuid4()),
-            name="Parent",
-            description=None,
-            category=None,
-            type=HabitType.BOOLEAN,
-            goal=None,
-        )
+    async def test_delete_habit_with_subhabits(
+        self, habit_service: HabitService, make_habit: MakeHabit
+    ) -> None:
+        parent = make_habit(name="Parent")
 
-        sub = Habit(
-            id=str(uuid.uuid4()),
-            name="Sub",
-            description=None,
-            category=None,
-            type=HabitType.BOOLEAN,
-            goal=None,
-        )
+        sub = make_habit(name="Sub")
+
+        await habit_service.create_habit(parent)
+        await habit_service.add_subhabit(parent.id, sub)
+
+        await habit_service.delete_habit(parent.id)
+
+        assert await habit_service.get_habit(parent.id) is None
+        assert await habit_service.get_habit(sub.id) is None
+
+    async def test_delete_habit_removes_nested_subhabits_and_logs(
+        self, habit_service: HabitService, make_habit: MakeHabit
+    ) -> None:
+        habits = [make_habit(name=f"Level {level}") for level in range(3)]
 
-        habit_service.create_habit(parent)
-        habit_service.add_subhabit(parent.id, sub)
+        await habit_service.create_habit(habits[0])
+        await habit_service.add_subhabit(habits[0].id, habits[1])
+        await habit_service.add_subhabit(habits[1].id, habits[2])
+        for habit in habits:
+            await habit_service.record_log(habit.id, TODAY, 1.0)
 
-        habit_service.delete_habit(parent.id)
+        await habit_service.delete_habit(habits[0].id)
 
-        assert habit_service.get_habit(parent.id) is None
-        assert habit_service.get_habit(sub.id) is None
+        for habit in habits:
+            assert await habit_service.get_habit(habit.id) is None
+        assert await habit_service.log_repo.list_all() == []
 
 
 class TestLogging:
-    def test_record_log(self, habit_service: HabitService, sample_habit: Habit) -> None:
-        habit_service.create_habit(sample_habit)
+    async def test_record_log(
+        self, habit_service: HabitService, sample_habit: Habit
+    ) -> None:
+        await habit_service.create_habit(sample_habit)
 
-        log = habit_service.record_log(
+        log = await habit_service.record_log(
             habit_id=sample_habit.id,
-            date_=date.today(),
+            date_=TODAY,
             value=1.0,
         )
 
         assert log.habit_id == sample_habit.id
-        assert log.date == date.today()
+        assert log.date == TODAY
         assert log.value == 1.0
 
-    def test_record_log_for_nonexistent_habit(
+    async def test_record_log_for_nonexistent_habit(
         self,
         habit_service: HabitService,
     ) -> None:
         with pytest.raises(ValueError, match="Habit not found"):
-            habit_service.record_log("nonexistent-id", date.today(), 1.0)
+            await habit_service.record_log("nonexistent-id", TODAY, 1.0)
 
-    def test_get_logs(self, habit_service: HabitService, sample_habit: Habit) -> None:
-        habit_service.create_habit(sample_habit)
+    async def test_get_logs(
+        self, habit_service: HabitService, sample_habit: Habit
+    ) -> None:
+        await habit_service.create_habit(sample_habit)
 
-        log1 = habit_service.record_log(sample_habit.id, date.today(), 1.0)
-        log2 = habit_service.record_log(
+        log1 = await habit_service.record_log(sample_habit.id, TODAY, 1.0)
+        log2 = await habit_service.record_log(
             sample_habit.id,
-            date.today() - timedelta(days=1),
+            YESTERDAY,
             1.0,
         )
 
-        logs = habit_service.get_logs(sample_habit.id)
+        logs = await habit_service.get_logs(sample_habit.id)
 
         assert len(logs) == 2
         assert logs[0].id in [log1.id, log2.id]
 
-    def test_get_logs_with_date_range(
+    async def test_get_logs_with_date_range(
         self,
         habit_service: HabitService,
         sample_habit: Habit,
     ) -> None:
-        habit_service.create_habit(sample_habit)
+        await habit_service.create_habit(sample_habit)
 
-        today = date.today()
-        habit_service.record_log(sample_habit.id, today, 1.0)
-        habit_service.record_log(sample_habit.id, today - timedelta(days=5), 1.0)
-        habit_service.record_log(sample_habit.id, today - timedelta(days=10), 1.0)
+        await habit_service.record_log(sample_habit.id, TODAY, 1.0)
+        await habit_service.record_log(sample_habit.id, TODAY - timedelta(days=5), 1.0)
+        await habit_service.record_log(sample_habit.id, TODAY - timedelta(days=10), 1.0)
 
-        logs = habit_service.get_logs(
+        logs = await habit_service.get_logs(
             sample_habit.id,
-            start=today - timedelta(days=7),
+            start=TODAY - timedelta(days=7),
         )
 
         assert len(logs) == 2
 
-    def test_get_logs_for_nonexistent_habit(
+    async def test_get_logs_sorted_within_range(
         self,
         habit_service: HabitService,
+        sample_habit: Habit,
     ) -> None:
-        with pytest.raises(ValueError, match="Habit not found"):
-            habit_service.get_logs("nonexistent-id")
+        await habit_service.create_habit(sample_habit)
 
+        for days_ago in (1, 8, 3, 0, 5):
+            await habit_service.record_log(
+                sample_habit.id, TODAY - timedelta(days=days_ago), 1.0
+            )
 
-class TestStatistics:
-    def test_boolean_habit_statistics(
+        logs = await habit_service.get_logs(
+            sample_habit.id,
+            start=TODAY - timedelta(days=5),
+            end=YESTERDAY,
+        )
+
+        assert [log.date for log in logs] == [
+            TODAY - timedelta(days=5),
+            TODAY - timedelta(days=3),
+            YESTERDAY,
+        ]
+
+    async def test_get_logs_for_habit_without_logs(
         self,
         habit_service: HabitService,
+        sample_habit: Habit,
     ) -> None:
-        habit = Habit(
-            id=str(uuid.uuid4()),
+        await habit_service.create_habit(sample_habit)
+
+        assert await habit_service.get_logs(sample_habit.id) == []
+
+    async def test_get_logs_for_nonexistent_habit(
+        self,
+        habit_service: HabitService,
+    ) -> None:
+        with pytest.raises(ValueError, match="Habit not found"):
+            await habit_service.get_logs("nonexistent-id")
+
+
+BOOLEAN_HABIT_ID = "seeded-boolean"
+NUMERIC_HABIT_ID = "seeded-numeric"
+
+
+@pytest.fixture(scope="module")
+async def seeded_service() -> HabitService:
+    """Read-only service seeded once for the statistics tests."""
+    service = HabitService(
+        habit_repo=InMemoryHabitRepository(),
+        log_repo=InMemoryLogRepository(),
+    )
+
+    await service.create_habit(
+        Habit(
+            id=BOOLEAN_HABIT_ID,
             name="Exercise",
             description=None,
             category=None,
             type=HabitType.BOOLEAN,
             goal=None,
         )
+    )
+    # a five-day streak ending TODAY
+    for i in range(5):
+        await service.record_log(BOOLEAN_HABIT_ID, TODAY - timedelta(days=i), 1.0)
 
-        habit_service.create_habit(habit)
-
-        # Create a streak
-        today = date.today()
-        for i in range(5):
-            habit_service.record_log(
-                habit.id,
-                today - timedelta(days=i),
-                1.0,
-            )
-
-        stats = habit_service.get_statistics(habit.id)
-
-        assert stats["current_streak"] == 5
-        assert stats["total_completions"] == 5
-        assert stats["completion_rate"] == 1.0
-
-    def test_numeric_habit_statistics(
-        self,
-        habit_service: HabitService,
-    ) -> None:
-        habit = Habit(
-            id=str(uuid.uuid4()),
+    await service.create_habit(
+        Habit(
+            id=NUMERIC_HABIT_ID,
             name="Read Pages",
             description=None,
             category=None,
             type=HabitType.NUMERIC,
             goal=10.0,
         )
+    )
+    await service.record_log(NUMERIC_HABIT_ID, TODAY, 15.0)
+    await service.record_log(NUMERIC_HABIT_ID, YESTERDAY, 12.0)
+    await service.record_log(NUMERIC_HABIT_ID, TODAY - timedelta(days=2), 5.0)
 
-        habit_service.create_habit(habit)
+    return service
 
-        today = date.today()
-        habit_service.record_log(habit.id, today, 15.0)
-        habit_service.record_log(habit.id, today - timedelta(days=1), 12.0)
-        habit_service.record_log(habit.id, today - timedelta(days=2), 5.0)
 
-        stats = habit_service.get_statistics(habit.id)
+class TestStatistics:
+    async def test_boolean_habit_statistics(
+        self,
+        seeded_service: HabitService,
+    ) -> None:
+        stats = await seeded_service.get_statistics(BOOLEAN_HABIT_ID)
 
-        assert stats["total_completions"] == 2  # Only 15 and 12 meet goal
-        assert stats["average_value"] == (15.0 + 12.0 + 5.0) / 3
+        assert stats.current_streak == 5
+        assert stats.total_completions == 5
+        assert stats.completion_rate == 1.0
 
-    def test_statistics_for_nonexistent_habit(
+    async def test_numeric_habit_statistics(
         self,
-        habit_service: HabitService,
+        seeded_service: HabitService,
+    ) -> None:
+        stats = await seeded_service.get_statistics(NUMERIC_HABIT_ID)
+
+        assert stats.total_completions == 2  # Only 15 and 12 meet goal
+        assert stats.average_value == (15.0 + 12.0 + 5.0) / 3
+
+    async def test_statistics_for_nonexistent_habit(
+        self,
+        seeded_service: HabitService,
     ) -> None:
         with pytest.raises(ValueError, match="Habit not found"):
-            habit_service.get_statistics("nonexistent-id")
+            await seeded_service.get_statistics("nonexistent-id")
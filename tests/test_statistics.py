@@ -1,194 +1,136 @@
-"""Unit tests for statistics calculators."""
+"""Unit tests for statistics calculators.
 
-import uuid
-from datetime import date, timedelta
+Calculators expect logs sorted by date, as the repositories return them.
+"""
 
-from app.core.models import Habit, HabitType, LogEntry
+from collections.abc import Generator, Sequence
+from datetime import timedelta
+
+import pytest
+
+from app.core.models import HabitType
 from app.core.statistics import (
     BooleanStatisticsCalculator,
     NumericStatisticsCalculator,
     StatisticsCalculatorFactory,
+    _calculate_streaks,
 )
 
+from tests.helpers import TODAY, MakeHabit, MakeLog
+
+# (days_ago, value) pairs, oldest first
+LogSpec = list[tuple[int, float]]
+
+BOOL_CALC = BooleanStatisticsCalculator()
+NUM_CALC = NumericStatisticsCalculator()
+
+BOOLEAN_CASES = [
+    # log_spec, (current_streak, longest_streak, total_completions, rate)
+    pytest.param([], (0, 0, 0, 0.0), id="empty"),
+    pytest.param([(0, 1.0)], (1, 1, 1, 1.0), id="single"),
+    pytest.param([(2, 1.0), (1, 1.0), (0, 1.0)], (3, 3, 3, 1.0), id="consecutive"),
+    pytest.param([(6, 1.0), (5, 1.0), (1, 1.0), (0, 1.0)], (2, 2, 4, 1.0), id="broken"),
+    pytest.param([(2, 1.0), (1, 0.0), (0, 1.0)], (1, 1, 2, 2 / 3), id="incomplete"),
+]
+
+_T = TODAY.toordinal()
+
+STREAK_CASES = [
+    # ascending day ordinals, (current_streak, longest_streak)
+    pytest.param([], (0, 0), id="empty"),
+    pytest.param(range(_T - 4, _T + 1), (5, 5), id="ending_today"),
+    pytest.param(range(_T - 9999, _T + 1), (10000, 10000), id="long"),
+    pytest.param([_T - 6, _T - 5, _T - 1, _T], (2, 2), id="broken"),
+    pytest.param(range(_T - 20, _T - 10), (0, 10), id="lapsed"),
+    pytest.param([_T + 1], (0, 1), id="future_only"),
+]
+
+NUMERIC_CASES = [
+    # goal, log_spec, (current_streak, longest_streak, total_completions, average)
+    pytest.param(
+        10.0, [(2, 5.0), (1, 12.0), (0, 15.0)], (2, 2, 2, 32.0 / 3), id="with_goal"
+    ),
+    pytest.param(None, [(1, 7000.0), (0, 5000.0)], (2, 2, 2, 6000.0), id="no_goal"),
+    pytest.param(
+        10.0, [(2, 11.0), (1, 12.0), (0, 15.0)], (3, 3, 3, 38.0 / 3), id="streak"
+    ),
+]
+
 
 class TestBooleanStatisticsCalculator:
-    def test_empty_logs(self) -> None:
-        habit = Habit(
-            id=str(uuid.uuid4()),
-            name="Test",
-            description=None,
-            category=None,
-            type=HabitType.BOOLEAN,
-            goal=None,
+    @pytest.mark.parametrize(("log_spec", "expected"), BOOLEAN_CASES)
+    def test_boolean_stats(
+        self,
+        make_habit: MakeHabit,
+        make_log: MakeLog,
+        log_spec: LogSpec,
+        expected: tuple[int, int, int, float],
+    ) -> None:
+        habit = make_habit()
+        logs = [make_log(habit.id, days_ago, value) for days_ago, value in log_spec]
+
+        result = BOOL_CALC.calculate(habit, logs)
+
+        assert (
+            result.current_streak,
+            result.longest_streak,
+            result.total_completions,
+            result.completion_rate,
+        ) == expected
+
+    def test_date_range(self, make_habit: MakeHabit, make_log: MakeLog) -> None:
+        habit = make_habit()
+
+        logs = [make_log(habit.id, i, 1.0) for i in reversed(range(6))]
+
+        result = BOOL_CALC.calculate(
+            habit,
+            logs,
+            start=TODAY - timedelta(days=4),
+            end=TODAY - timedelta(days=2),
         )
 
-        calculator = BooleanStatisticsCalculator()
-        result = calculator.calculate(habit, [])
-
+        assert result.total_days_tracked == 3
+        assert result.total_completions == 3
         assert result.current_streak == 0
-        assert result.longest_streak == 0
-        assert result.total_completions == 0
-        assert result.completion_rate == 0.0
-
-    def test_single_completion(self) -> None:
-        habit = Habit(
-            id=str(uuid.uuid4()),
-            name="Test",
-            description=None,
-            category=None,
-            type=HabitType.BOOLEAN,
-            goal=None,
-        )
 
-        logs = [
-            LogEntry.create(habit.id, date.today(), 1.0),
-        ]
-
-        calculator = BooleanStatisticsCalculator()
-        result = calculator.calculate(habit, logs)
-
-        assert result.current_streak == 1
-        assert result.total_completions == 1
-        assert result.completion_rate == 1.0
-
-    def test_consecutive_streak(self) -> None:
-        habit = Habit(
-            id=str(uuid.uuid4()),
-            name="Test",
-            description=None,
-            category=None,
-            type=HabitType.BOOLEAN,
-            goal=None,
-        )
-
-        today = date.today()
-        logs = [
-            LogEntry.create(habit.id, today, 1.0),
-            LogEntry.create(habit.id, today - timedelta(days=1), 1.0),
-            LogEntry.create(habit.id, today - timedelta(days=2), 1.0),
-        ]
-
-        calculator = BooleanStatisticsCalculator()
-        result = calculator.calculate(habit, logs)
-
-        assert result.current_streak == 3
-        assert result.longest_streak == 3
-
-    def test_broken_streak(self) -> None:
-        habit = Habit(
-            id=str(uuid.uuid4()),
-            name="Test",
-            description=None,
-            category=None,
-            type=HabitType.BOOLEAN,
-            goal=None,
-        )
 
-        today = date.today()
-        logs = [
-            LogEntry.create(habit.id, today, 1.0),
-            LogEntry.create(habit.id, today - timedelta(days=1), 1.0),
-            LogEntry.create(habit.id, today - timedelta(days=5), 1.0),
-            LogEntry.create(habit.id, today - timedelta(days=6), 1.0),
-        ]
-
-        calculator = BooleanStatisticsCalculator()
-        result = calculator.calculate(habit, logs)
-
-        assert result.current_streak == 2
-        assert result.longest_streak == 2
-
-    def test_incomplete_logs(self) -> None:
-        habit = Habit(
-            id=str(uuid.uuid4()),
-            name="Test",
-            description=None,
-            category=None,
-            type=HabitType.BOOLEAN,
-            goal=None,
-        )
-
-        today = date.today()
-        logs = [
-            LogEntry.create(habit.id, today, 1.0),
-            LogEntry.create(habit.id, today - timedelta(days=1), 0.0),
-            LogEntry.create(habit.id, today - timedelta(days=2), 1.0),
-        ]
-
-        calculator = BooleanStatisticsCalculator()
-        result = calculator.calculate(habit, logs)
-
-        assert result.total_completions == 2
-        assert result.completion_rate == 2 / 3
+class TestNumericStatisticsCalculator:
+    @pytest.mark.parametrize(("goal", "log_spec", "expected"), NUMERIC_CASES)
+    def test_numeric_stats(
+        self,
+        make_habit: MakeHabit,
+        make_log: MakeLog,
+        goal: float | None,
+        log_spec: LogSpec,
+        expected: tuple[int, int, int, float],
+    ) -> None:
+        habit = make_habit(type=HabitType.NUMERIC, goal=goal)
+        logs = [make_log(habit.id, days_ago, value) for days_ago, value in log_spec]
 
+        result = NUM_CALC.calculate(habit, logs)
 
-class TestNumericStatisticsCalculator:
-    def test_with_goal(self) -> None:
-        habit = Habit(
-            id=str(uuid.uuid4()),
-            name="Read Pages",
-            description=None,
-            category=None,
-            type=HabitType.NUMERIC,
-            goal=10.0,
-        )
+        assert (
+            result.current_streak,
+            result.longest_streak,
+            result.total_completions,
+            result.average_value,
+        ) == expected
 
-        today = date.today()
-        logs = [
-            LogEntry.create(habit.id, today, 15.0),
-            LogEntry.create(habit.id, today - timedelta(days=1), 12.0),
-            LogEntry.create(habit.id, today - timedelta(days=2), 5.0),
-        ]
-
-        calculator = NumericStatisticsCalculator()
-        result = calculator.calculate(habit, logs)
-
-        assert result.total_completions == 2
-        assert result.average_value == (15.0 + 12.0 + 5.0) / 3
-
-    def test_without_goal(self) -> None:
-        habit = Habit(
-            id=str(uuid.uuid4()),
-            name="Steps",
-            description=None,
-            category=None,
-            type=HabitType.NUMERIC,
-            goal=None,
-        )
 
-        today = date.today()
-        logs = [
-            LogEntry.create(habit.id, today, 5000.0),
-            LogEntry.create(habit.id, today - timedelta(days=1), 7000.0),
-        ]
-
-        calculator = NumericStatisticsCalculator()
-        result = calculator.calculate(habit, logs)
-
-        assert result.total_completions == 2
-        assert result.average_value == 6000.0
-
-    def test_numeric_streak(self) -> None:
-        habit = Habit(
-            id=str(uuid.uuid4()),
-            name="Test",
-            description=None,
-            category=None,
-            type=HabitType.NUMERIC,
-            goal=10.0,
-        )
+class TestStreaks:
+    """The streak kernel on bare day ordinals, pinned to TODAY."""
 
-        today = date.today()
-        logs = [
-            LogEntry.create(habit.id, today, 15.0),
-            LogEntry.create(habit.id, today - timedelta(days=1), 12.0),
-            LogEntry.create(habit.id, today - timedelta(days=2), 11.0),
-        ]
+    @pytest.mark.parametrize(("days", "expected"), STREAK_CASES)
+    def test_streaks(self, days: Sequence[int], expected: tuple[int, int]) -> None:
+        assert _calculate_streaks(days, _T) == expected
 
-        calculator = NumericStatisticsCalculator()
-        result = calculator.calculate(habit, logs)
 
-        assert result.current_streak == 3
+@pytest.fixture
+def calculator_registry() -> Generator[None]:
+    saved = dict(StatisticsCalculatorFactory._calculators)
+    yield
+    StatisticsCalculatorFactory._calculators = saved
 
 
 class TestStatisticsCalculatorFactory:
@@ -200,6 +142,7 @@ class TestStatisticsCalculatorFactory:
         calculator = StatisticsCalculatorFactory.get_calculator(HabitType.NUMERIC)
         assert isinstance(calculator, NumericStatisticsCalculator)
 
+    @pytest.mark.usefixtures("calculator_registry")
     def test_register_new_calculator(self) -> None:
         class CustomCalculator(BooleanStatisticsCalculator):
             pass